@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class AgeBinScheme:
+    """Klassengrenzen für Altersgruppen.
+
+    Die Klassen sind links geschlossen, rechts offen (``[70, 75)``), wie bisher bei
+    ``pd.cut(..., right=False)``. Werte unterhalb der ersten bzw. ab der letzten
+    Grenze werden als Unter-/Überlauf gezählt.
+    """
+
+    name: str
+    edges: tuple
+    labels: tuple
+
+    def __post_init__(self):
+        if len(self.edges) < 2:
+            raise ValueError("Mindestens zwei Klassengrenzen erforderlich")
+        if any(b <= a for a, b in zip(self.edges[:-1], self.edges[1:])):
+            raise ValueError("Klassengrenzen müssen streng aufsteigend sein")
+        if len(self.labels) != len(self.edges) - 1:
+            raise ValueError("Anzahl der Labels muss der Anzahl der Klassen entsprechen")
+
+
+@dataclass
+class AgeBinResult:
+    """Ergebnis einer Klassierung inkl. Unter-/Überlauf und fehlender Werte."""
+
+    scheme: AgeBinScheme
+    counts: np.ndarray
+    underflow: int = 0
+    overflow: int = 0
+    missing: int = 0
+
+    @property
+    def total(self) -> int:
+        """Anzahl der Werte innerhalb der Klassen."""
+        return int(self.counts.sum())
+
+    def as_series(self) -> pd.Series:
+        """Häufigkeiten je Altersgruppe in Klassenreihenfolge."""
+        index = pd.Index(self.scheme.labels, name="Altersgruppe")
+        return pd.Series(self.counts, index=index, name="Anzahl")
+
+    def as_frame(self) -> pd.DataFrame:
+        """Häufigkeiten als Tabelle mit den Spalten ``Altersgruppe`` und ``Anzahl``."""
+        return self.as_series().reset_index()
+
+
+def make_labels(edges) -> tuple:
+    """Erzeugt Labels im Stil ``70-74`` bzw. ``95+`` für die letzte Klasse."""
+    edges = list(edges)
+    labels = [f"{a}-{b - 1}" for a, b in zip(edges[:-2], edges[1:-1])]
+    labels.append(f"{edges[-2]}+")
+    return tuple(labels)
+
+
+def make_scheme(edges, labels=None, name: str = "Benutzerdefiniert") -> AgeBinScheme:
+    """Erstellt ein Schema aus beliebigen (z. B. ungleich breiten) Klassengrenzen.
+
+    Für ``facility_summary.age_groups`` müssen die Grenzen ganze Jahre sein.
+    """
+    edges = tuple(edges)
+    labels = tuple(labels) if labels is not None else make_labels(edges)
+    return AgeBinScheme(name=name, edges=edges, labels=labels)
+
+
+# === Vordefinierte Schemata ===
+FUENF_JAHRE = make_scheme([70, 75, 80, 85, 90, 95, 100], name="5-Jahres-Gruppen")
+ZEHN_JAHRE = make_scheme([60, 70, 80, 90, 100], name="10-Jahres-Gruppen")
+# Ungleich breite Gruppen wie in der Pflegestatistik (Pflegebedürftige nach Altersgruppen)
+PFLEGESTATISTIK = make_scheme(
+    [0, 60, 65, 70, 75, 80, 85, 90, 130],
+    labels=["unter 60", "60-64", "65-69", "70-74", "75-79", "80-84", "85-89", "90+"],
+    name="Pflegestatistik",
+)
+
+STANDARD_SCHEMA = FUENF_JAHRE
+
+SCHEMATA = {scheme.name: scheme for scheme in (FUENF_JAHRE, ZEHN_JAHRE, PFLEGESTATISTIK)}
+
+
+def bin_ages(ages, scheme: AgeBinScheme = STANDARD_SCHEMA, weights=None) -> AgeBinResult:
+    """Klassiert Alterswerte vektorisiert mit ``searchsorted``/``bincount``.
+
+    ``ages`` kann eine Series oder ein Array sein; fehlende Werte werden gezählt,
+    aber nicht klassiert. Mit ``weights`` lassen sich bereits aggregierte
+    Häufigkeiten (z. B. ein Histogramm) umklassieren.
+    """
+    values = np.asarray(ages, dtype=float)
+    valid = ~np.isnan(values)
+    edges = np.asarray(scheme.edges, dtype=float)
+    n_bins = len(edges) - 1
+
+    if weights is not None:
+        weights = np.asarray(weights)
+        missing = weights[~valid].sum()
+        w = weights[valid]
+    else:
+        missing = int((~valid).sum())
+        w = None
+
+    # Position 0 = Unterlauf, 1..n_bins = Klassen, n_bins + 1 = Überlauf
+    pos = np.searchsorted(edges, values[valid], side="right")
+    counts = np.bincount(pos, weights=w, minlength=n_bins + 2)
+    if w is not None and np.issubdtype(w.dtype, np.integer):
+        counts = counts.astype(np.int64)
+
+    return AgeBinResult(
+        scheme=scheme,
+        counts=counts[1:n_bins + 1],
+        underflow=int(counts[0]),
+        overflow=int(counts[n_bins + 1]),
+        missing=int(missing),
+    )
@@ -0,0 +1,97 @@
+import copy
+from functools import lru_cache
+
+import altair as alt
+import pandas as pd
+
+from corporate_design import BRAND_ROT, GRAU_DUNKEL, GRID_GRAU
+
+DATEN_NAME = "counts"
+
+
+def _brand_config(chart: alt.Chart) -> alt.Chart:
+    """Achsen-Styling im Corporate Design – einmal in der Config statt je Achse."""
+    return (
+        chart
+        .configure_axis(
+            labelFontSize=13,
+            labelFontWeight=600,
+            labelColor=GRAU_DUNKEL,
+            titleFontSize=15,
+            titleFontWeight="bold",
+            titleColor=GRAU_DUNKEL,
+            titlePadding=15,
+            domainColor=GRAU_DUNKEL,
+            domainWidth=2,
+            tickColor=GRAU_DUNKEL,
+            tickWidth=2,
+        )
+        .configure_axisX(labelAngle=0, labelPadding=10)
+        .configure_axisY(grid=True, gridOpacity=0.5, gridColor=GRID_GRAU, gridWidth=1)
+        .configure_view(strokeWidth=0)
+    )
+
+
+@lru_cache(maxsize=None)
+def _template(feld: str, y_titel: str, height: int, label_font_size: int, label_limit, daten_reihenfolge: bool) -> dict:
+    """Baut die Vega-Lite-Spezifikation ohne Daten einmalig auf (nur lesend verwenden)."""
+    x_axis = {"labelFontSize": label_font_size}
+    if label_limit is not None:
+        x_axis["labelLimit"] = label_limit
+    
+    chart = (
+        alt.Chart(alt.NamedData(name=DATEN_NAME))
+        .mark_bar(
+            color=BRAND_ROT,
+            cornerRadiusTopLeft=8,
+            cornerRadiusTopRight=8,
+            opacity=0.95
+        )
+        .encode(
+            x=alt.X(
+                f"{feld}:N",
+                title=feld,
+                sort=None if daten_reihenfolge else "ascending",
+                axis=alt.Axis(**x_axis),
+            ),
+            y=alt.Y("Anzahl:Q", title=y_titel, axis=alt.Axis(tickMinStep=1)),
+            tooltip=[
+                alt.Tooltip(f"{feld}:N", title=feld),
+                alt.Tooltip("Anzahl:Q", title=y_titel)
+            ]
+        )
+        .properties(height=height)
+    )
+    return _brand_config(chart).to_dict()
+
+
+@lru_cache(maxsize=256)
+def _spec(template_key: tuple, labels: tuple, werte: tuple) -> dict:
+    """Setzt die aggregierte Zähltabelle in die Vorlage ein (gecacht je Datensatz, nur lesend verwenden)."""
+    feld = template_key[0]
+    spec = dict(_template(*template_key))
+    spec["data"] = {"values": [{feld: label, "Anzahl": wert} for label, wert in zip(labels, werte)]}
+    return spec
+
+
+def bar_chart_spec(
+    counts: pd.Series,
+    feld: str,
+    y_titel: str = "Anzahl",
+    height: int = 400,
+    label_font_size: int = 13,
+    label_limit: int = None,
+    daten_reihenfolge: bool = False,
+) -> dict:
+    """Balkendiagramm-Spezifikation im Corporate Design aus vorab gezählten Werten.
+
+    ``counts`` enthält je Kategorie die Anzahl (z. B. aus der Facility-Summary).
+    Mit ``daten_reihenfolge`` bleibt die Reihenfolge von ``counts`` erhalten
+    (z. B. für Altersgruppen), sonst wird alphabetisch sortiert.
+    Vorlage und fertige Spezifikation werden gecacht; zurückgegeben wird jeweils
+    eine frische Kopie für ``st.vega_lite_chart``.
+    """
+    labels = tuple(str(label) for label in counts.index)
+    werte = tuple(int(wert) for wert in counts.values)
+    template_key = (feld, y_titel, height, label_font_size, label_limit, daten_reihenfolge)
+    return copy.deepcopy(_spec(template_key, labels, werte))
@@ -0,0 +1 @@
+# Projektwurzel für pytest auf den Importpfad legen (Module liegen direkt im Repo).
@@ -0,0 +1,6 @@
+# === Corporate Design ===
+BRAND_ROT = "#e2001A"
+GRAU_DUNKEL = "#333333"
+GRAU_MITTEL = "#666666"
+GRAU_HELL = "#f5f5f5"
+GRID_GRAU = "#cccccc"
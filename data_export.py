@@ -0,0 +1,105 @@
+import codecs
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# === Export-Einstellungen ===
+CHUNK_ZEILEN = 5000  # Zeilen pro Block beim Schreiben
+
+CSV_TRENNZEICHEN = ";"  # Excel (deutsch) erwartet Semikolon …
+CSV_DEZIMALZEICHEN = ","  # … und Dezimalkomma
+
+
+def _iter_chunks(df: pd.DataFrame, mask=None, chunk_zeilen: int = CHUNK_ZEILEN):
+    """Liefert die (gefilterten) Zeilen blockweise, ohne eine gefilterte Kopie des gesamten DataFrames anzulegen."""
+    if mask is None:
+        positionen = np.arange(len(df))
+    else:
+        positionen = np.flatnonzero(np.asarray(mask, dtype=bool))
+
+    for start in range(0, len(positionen), chunk_zeilen):
+        yield df.iloc[positionen[start:start + chunk_zeilen]]
+
+
+def _excel_wert(wert):
+    """Wandelt pandas-/numpy-Werte in Typen um, die openpyxl schreiben kann."""
+    if wert is None or wert is pd.NaT or wert is pd.NA:
+        return None
+    if isinstance(wert, pd.Timestamp):
+        return wert.to_pydatetime()
+    if isinstance(wert, np.generic):
+        wert = wert.item()
+    if isinstance(wert, float) and np.isnan(wert):
+        return None
+    return wert
+
+
+def write_xlsx(df: pd.DataFrame, fh, mask=None, sheet_name: str = "Bewohner") -> None:
+    """Schreibt die Zeilen im openpyxl-Write-Only-Modus zeilenweise als .xlsx."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append([str(spalte) for spalte in df.columns])
+
+    for chunk in _iter_chunks(df, mask):
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append([_excel_wert(wert) for wert in row])
+
+    wb.save(fh)
+
+
+def write_csv(df: pd.DataFrame, fh, mask=None) -> None:
+    """Schreibt die Zeilen blockweise als CSV (UTF-8 mit BOM für Excel)."""
+    fh.write(codecs.BOM_UTF8)
+    header = True
+    for chunk in _iter_chunks(df, mask):
+        fh.write(
+            chunk.to_csv(sep=CSV_TRENNZEICHEN, decimal=CSV_DEZIMALZEICHEN, index=False, header=header).encode("utf-8")
+        )
+        header = False
+    if header:
+        # Keine Zeilen: nur Kopfzeile schreiben
+        fh.write(df.iloc[:0].to_csv(sep=CSV_TRENNZEICHEN, decimal=CSV_DEZIMALZEICHEN, index=False).encode("utf-8"))
+
+
+def write_parquet(df: pd.DataFrame, fh, mask=None) -> None:
+    """Schreibt die Zeilen blockweise als Parquet."""
+    writer = None
+    try:
+        for chunk in _iter_chunks(df, mask):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(fh, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(df.iloc[:0], preserve_index=False), fh)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Format -> (Schreibfunktion, Dateiendung, MIME-Typ)
+EXPORT_FORMATE = {
+    "Excel (.xlsx)": (write_xlsx, "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": (write_csv, "csv", "text/csv"),
+    "Parquet": (write_parquet, "parquet", "application/vnd.apache.parquet"),
+}
+
+
+def export_rows(df: pd.DataFrame, format_name: str, mask=None) -> bytes:
+    """Exportiert die (gefilterten) Zeilen im gewünschten Format für ``st.download_button``.
+
+    Die fertige Datei liegt vollständig im Speicher, da ``st.download_button`` die
+    Daten ohnehin komplett benötigt. Eingespart werden die gefilterte Kopie des
+    DataFrames und ein im Speicher aufgebautes Workbook-Objekt, weil die Zeilen
+    blockweise direkt in den Ausgabepuffer geschrieben werden.
+    """
+    writer, _, _ = EXPORT_FORMATE[format_name]
+    buf = BytesIO()
+    writer(df, buf, mask=mask)
+    return buf.getvalue()
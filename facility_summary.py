@@ -0,0 +1,271 @@
+import json
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from age_binning import AgeBinResult, AgeBinScheme, STANDARD_SCHEMA, bin_ages
+
+# === Sketch-Einstellungen ===
+# Feines Altershistogramm mit festen 1-Jahres-Klassen. Es dient gleichzeitig als
+# Quantil-Sketch für den Median: Bei ganzzahligen Altersangaben ist der Median exakt,
+# sonst wird innerhalb der Klasse interpoliert (Fehler kleiner als die Klassenbreite).
+ALTER_MIN = 0
+ALTER_MAX = 130
+ALTER_KLASSEN = ALTER_MAX - ALTER_MIN
+
+# Kategoriale Spalten, für die exakte Häufigkeiten geführt werden
+KATEGORIE_SPALTEN = ("Betreuungsbedarf", "Abteilung", "Einzelzimmer")
+
+FORMAT_VERSION = 1
+
+
+@dataclass(eq=False)
+class FacilitySummary:
+    """Mergebare Kurzfassung einer Einrichtung (ohne Rohdaten).
+
+    Enthält exakte Kategorie-Häufigkeiten, ein Altershistogramm mit festen
+    1-Jahres-Klassen sowie Summen für den Mittelwert. Zwei Summaries lassen sich
+    in O(Klassen) zusammenführen.
+    """
+
+    anzahl: int = 0
+    alter_anzahl: int = 0
+    alter_summe: float = 0.0
+    alter_unterlauf: int = 0
+    alter_ueberlauf: int = 0
+    alter_histogramm: np.ndarray = field(default_factory=lambda: np.zeros(ALTER_KLASSEN, dtype=np.int64))
+    alter_ganzzahlig: bool = True
+    kategorien: dict = field(default_factory=dict)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FacilitySummary):
+            return NotImplemented
+        return (
+            self.anzahl == other.anzahl
+            and self.alter_anzahl == other.alter_anzahl
+            # Fließkomma-Summe hängt von der Merge-Reihenfolge ab
+            and math.isclose(self.alter_summe, other.alter_summe, rel_tol=1e-12, abs_tol=1e-9)
+            and self.alter_unterlauf == other.alter_unterlauf
+            and self.alter_ueberlauf == other.alter_ueberlauf
+            and np.array_equal(self.alter_histogramm, other.alter_histogramm)
+            and self.alter_ganzzahlig == other.alter_ganzzahlig
+            and self.kategorien == other.kategorien
+        )
+
+    def merge(self, other: "FacilitySummary") -> "FacilitySummary":
+        """Führt zwei Summaries zu einer neuen zusammen."""
+        kategorien = {spalte: dict(werte) for spalte, werte in self.kategorien.items()}
+        for spalte, werte in other.kategorien.items():
+            ziel = kategorien.setdefault(spalte, {})
+            for wert, anzahl in werte.items():
+                ziel[wert] = ziel.get(wert, 0) + anzahl
+
+        return FacilitySummary(
+            anzahl=self.anzahl + other.anzahl,
+            alter_anzahl=self.alter_anzahl + other.alter_anzahl,
+            alter_summe=self.alter_summe + other.alter_summe,
+            alter_unterlauf=self.alter_unterlauf + other.alter_unterlauf,
+            alter_ueberlauf=self.alter_ueberlauf + other.alter_ueberlauf,
+            alter_histogramm=self.alter_histogramm + other.alter_histogramm,
+            alter_ganzzahlig=self.alter_ganzzahlig and other.alter_ganzzahlig,
+            kategorien=kategorien,
+        )
+
+    def to_dict(self) -> dict:
+        """Serialisierbare Darstellung (z. B. für JSON-Export)."""
+        return {
+            "version": FORMAT_VERSION,
+            "anzahl": self.anzahl,
+            "alter": {
+                "min": ALTER_MIN,
+                "max": ALTER_MAX,
+                "anzahl": self.alter_anzahl,
+                "summe": self.alter_summe,
+                "unterlauf": self.alter_unterlauf,
+                "ueberlauf": self.alter_ueberlauf,
+                "histogramm": self.alter_histogramm.tolist(),
+                "ganzzahlig": self.alter_ganzzahlig,
+            },
+            "kategorien": self.kategorien,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FacilitySummary":
+        """Liest eine mit ``to_dict`` erzeugte Darstellung wieder ein."""
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unbekannte Summary-Version: {data.get('version')}")
+        alter = data["alter"]
+        if alter["min"] != ALTER_MIN or alter["max"] != ALTER_MAX:
+            raise ValueError("Altershistogramm mit abweichenden Klassengrenzen kann nicht gemergt werden")
+        histogramm = np.asarray(alter["histogramm"], dtype=np.int64)
+        if histogramm.shape != (ALTER_KLASSEN,):
+            raise ValueError(
+                f"Altershistogramm hat {histogramm.size} statt {ALTER_KLASSEN} Klassen"
+            )
+
+        return cls(
+            anzahl=int(data["anzahl"]),
+            alter_anzahl=int(alter["anzahl"]),
+            alter_summe=float(alter["summe"]),
+            alter_unterlauf=int(alter["unterlauf"]),
+            alter_ueberlauf=int(alter["ueberlauf"]),
+            alter_histogramm=histogramm,
+            alter_ganzzahlig=bool(alter["ganzzahlig"]),
+            kategorien={spalte: {str(k): int(v) for k, v in werte.items()} for spalte, werte in data["kategorien"].items()},
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> "FacilitySummary":
+        return cls.from_dict(json.loads(text))
+
+
+def summarize_facility(df: pd.DataFrame) -> FacilitySummary:
+    """Erstellt die Kurzfassung einer Einrichtung aus den Rohdaten (einmaliger Durchlauf)."""
+    summary = FacilitySummary(anzahl=len(df))
+
+    if "Alter" in df.columns:
+        alter = pd.to_numeric(df["Alter"], errors="coerce").to_numpy(dtype=float)
+        alter = alter[~np.isnan(alter)]
+        summary.alter_anzahl = int(alter.size)
+        summary.alter_summe = float(alter.sum())
+        summary.alter_ganzzahlig = bool(np.all(alter == np.floor(alter)))
+
+        idx = np.floor(alter).astype(np.int64) - ALTER_MIN
+        unten = idx < 0
+        oben = idx >= ALTER_KLASSEN
+        summary.alter_unterlauf = int(unten.sum())
+        summary.alter_ueberlauf = int(oben.sum())
+        summary.alter_histogramm = np.bincount(idx[~(unten | oben)], minlength=ALTER_KLASSEN).astype(np.int64)
+
+    for spalte in KATEGORIE_SPALTEN:
+        if spalte in df.columns:
+            counts = df[spalte].value_counts()
+            summary.kategorien[spalte] = {str(k): int(v) for k, v in counts.items()}
+
+    return summary
+
+
+def merge_summaries(summaries) -> FacilitySummary:
+    """Führt beliebig viele Summaries zu einer Gesamtsicht zusammen."""
+    gesamt = FacilitySummary()
+    for summary in summaries:
+        gesamt = gesamt.merge(summary)
+    return gesamt
+
+
+# === Kennzahlen aus der Summary ===
+
+def age_mean(summary: FacilitySummary) -> float:
+    """Durchschnittsalter (exakt)."""
+    if summary.alter_anzahl == 0:
+        return float("nan")
+    return summary.alter_summe / summary.alter_anzahl
+
+
+def age_quantile(summary: FacilitySummary, q: float) -> float:
+    """Quantil des Alters aus dem Histogramm (lineare Interpolation wie ``pandas.quantile``).
+
+    Bei ganzzahligen Altersangaben ist das Ergebnis exakt. Sonst wird der Wert eines
+    Rangs gleichverteilt innerhalb seiner 1-Jahres-Klasse angenommen. Unter- und
+    Überlauf werden der unteren bzw. oberen Grenze des Histogramms zugeschlagen.
+    """
+    n = summary.alter_anzahl
+    if n == 0:
+        return float("nan")
+
+    kumuliert = np.cumsum(summary.alter_histogramm)
+    kumuliert = kumuliert + summary.alter_unterlauf
+
+    def _wert_an(rang: int) -> float:
+        if rang < summary.alter_unterlauf:
+            return float(ALTER_MIN)
+        pos = int(np.searchsorted(kumuliert, rang, side="right"))
+        if pos >= ALTER_KLASSEN:
+            return float(ALTER_MAX)
+        if summary.alter_ganzzahlig:
+            return float(ALTER_MIN + pos)
+        # Gleichverteilung innerhalb der Klasse annehmen
+        davor = kumuliert[pos] - summary.alter_histogramm[pos]
+        return ALTER_MIN + pos + (rang - davor + 0.5) / summary.alter_histogramm[pos]
+
+    h = (n - 1) * q
+    unten = int(np.floor(h))
+    oben = int(np.ceil(h))
+    wert_unten = _wert_an(unten)
+    wert_oben = _wert_an(oben)
+    return wert_unten + (h - unten) * (wert_oben - wert_unten)
+
+
+def age_median(summary: FacilitySummary) -> float:
+    """Median des Alters aus dem Histogramm."""
+    return age_quantile(summary, 0.5)
+
+
+def age_at_least(summary: FacilitySummary, grenze: int) -> int:
+    """Anzahl Bewohner mit Alter >= ``grenze``."""
+    start = max(grenze - ALTER_MIN, 0)
+    return int(summary.alter_histogramm[start:].sum()) + summary.alter_ueberlauf
+
+
+def age_groups(summary: FacilitySummary, scheme: AgeBinScheme = STANDARD_SCHEMA) -> AgeBinResult:
+    """Bewohner je Altersgruppe, direkt aus dem Histogramm umklassiert.
+
+    Das Histogramm hat 1-Jahres-Klassen; Schemata mit nicht ganzzahligen Grenzen
+    oder Grenzen außerhalb von [ALTER_MIN, ALTER_MAX] lassen sich daraus nicht
+    korrekt ableiten und werden abgelehnt (dafür ``bin_ages`` auf den Rohdaten nutzen).
+    """
+    for grenze in scheme.edges:
+        if grenze != int(grenze) or not ALTER_MIN <= grenze <= ALTER_MAX:
+            raise ValueError(
+                f"Klassengrenze {grenze} von '{scheme.name}' passt nicht zum Altershistogramm "
+                f"(ganze Jahre zwischen {ALTER_MIN} und {ALTER_MAX} erforderlich)"
+            )
+    klassen = np.arange(ALTER_MIN, ALTER_MAX)
+    result = bin_ages(klassen, scheme, weights=summary.alter_histogramm)
+    result.underflow += summary.alter_unterlauf
+    result.overflow += summary.alter_ueberlauf
+    return result
+
+
+def category_counts(summary: FacilitySummary, spalte: str) -> pd.Series:
+    """Häufigkeiten einer Kategorie, absteigend sortiert (wie ``value_counts``)."""
+    werte = summary.kategorien.get(spalte, {})
+    counts = pd.Series(werte, dtype="int64", name="Anzahl")
+    return counts.sort_values(ascending=False, kind="stable")
+
+
+def sort_categories(counts: pd.Series) -> pd.Series:
+    """Sortiert Kategorien wie ``sort_index`` auf den Originalwerten.
+
+    Die Summary speichert Kategorien als Text; numerische Codes werden daher
+    numerisch ("2" vor "10") und vor Texten einsortiert.
+    """
+    def _schluessel(wert: str):
+        try:
+            return (0, float(wert), "")
+        except ValueError:
+            return (1, 0.0, wert)
+
+    return counts.reindex(sorted(counts.index, key=_schluessel))
+
+
+def summary_kpis(summary: FacilitySummary) -> dict:
+    """Kennzahlen wie im KPI-Dashboard, berechnet aus der Summary."""
+    total = summary.anzahl
+    hoch = summary.kategorien.get("Betreuungsbedarf", {}).get("hoch", 0)
+    einzelzimmer = summary.kategorien.get("Einzelzimmer", {}).get("Ja", 0)
+
+    return {
+        "bewohner_gesamt": total,
+        "durchschnittsalter": age_mean(summary),
+        "median_alter": age_median(summary),
+        "hoher_bedarf": hoch,
+        "hoher_bedarf_anteil": (hoch / total * 100) if total > 0 else 0,
+        "einzelzimmer": einzelzimmer,
+        "einzelzimmer_anteil": (einzelzimmer / total * 100) if total > 0 else 0,
+    }
@@ -0,0 +1,216 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from age_binning import AgeBinScheme, STANDARD_SCHEMA
+from facility_summary import (
+    FacilitySummary,
+    age_at_least,
+    age_groups,
+    age_mean,
+    age_median,
+    category_counts,
+)
+
+HOCHBETAGT_AB = 90
+
+
+# === Statistiken (hashbar, dienen als Cache-Schlüssel) ===
+
+class AltersStatistik(NamedTuple):
+    total: int
+    durchschnitt: float
+    median: float
+    gruppen: tuple  # ((Label, Anzahl), ...) in Klassenreihenfolge
+    hochbetagte: int
+
+
+class KategorieStatistik(NamedTuple):
+    total: int
+    counts: tuple  # ((Wert, Anzahl), ...) absteigend wie value_counts
+
+
+def age_statistics(
+    summary: FacilitySummary,
+    scheme: AgeBinScheme = STANDARD_SCHEMA,
+    median: float = None,
+) -> AltersStatistik:
+    """Kennzahlen für den Alters-Text aus der Summary.
+
+    Liegen die Rohdaten vor, sollte der exakte ``median`` übergeben werden; sonst
+    wird er aus dem Histogramm der Summary geschätzt.
+    """
+    gruppen = age_groups(summary, scheme).as_series()
+    return AltersStatistik(
+        total=summary.anzahl,
+        durchschnitt=age_mean(summary),
+        median=age_median(summary) if median is None else float(median),
+        gruppen=tuple((str(label), int(anzahl)) for label, anzahl in gruppen.items()),
+        hochbetagte=age_at_least(summary, HOCHBETAGT_AB),
+    )
+
+
+def category_statistics(summary: FacilitySummary, spalte: str) -> KategorieStatistik:
+    """Kennzahlen für einen Kategorie-Text aus der Summary."""
+    counts = category_counts(summary, spalte)
+    return KategorieStatistik(
+        total=summary.anzahl,
+        counts=tuple((str(wert), int(anzahl)) for wert, anzahl in counts.items()),
+    )
+
+
+# === Textbausteine (gecacht je Statistik) ===
+
+@lru_cache(maxsize=1024)
+def age_text(stats: AltersStatistik) -> str:
+    """Erstellt intelligente Analyse der Altersverteilung."""
+    total = stats.total
+
+    # Größte Gruppe (bei Gleichstand die erste in Klassenreihenfolge)
+    sortiert = sorted(stats.gruppen, key=lambda gruppe: gruppe[1], reverse=True)
+    groesste_gruppe, groesste_anzahl = sortiert[0]
+    groesste_prozent = (groesste_anzahl / total * 100)
+
+    # Zweitgrößte Gruppe
+    zweitgroesste_gruppe, zweitgroesste_anzahl = sortiert[1] if len(sortiert) > 1 else (None, 0)
+
+    # Hochbetagte (90+)
+    hochbetagte = stats.hochbetagte
+    hochbetagte_prozent = (hochbetagte / total * 100) if total > 0 else 0
+
+    text = (
+        f"Die am stärksten vertretene Altersgruppe ist {groesste_gruppe} Jahre mit {groesste_anzahl} Bewohnern "
+        f"({groesste_prozent:.1f}% aller Bewohner). "
+    )
+
+    if zweitgroesste_gruppe:
+        text += (
+            f"Darauf folgt die Altersgruppe {zweitgroesste_gruppe} Jahre mit {zweitgroesste_anzahl} Bewohnern. "
+        )
+
+    text += (
+        f"Das Durchschnittsalter beträgt {stats.durchschnitt:.1f} Jahre, der Median liegt bei {stats.median:.1f} Jahren. "
+    )
+
+    if hochbetagte_prozent > 20:
+        text += (
+            f"Mit {hochbetagte} Bewohnern über 90 Jahren ({hochbetagte_prozent:.1f}%) zeigt sich ein hoher Anteil "
+            f"hochbetagter Personen, was besondere Anforderungen an die Pflege stellt."
+        )
+    elif hochbetagte > 0:
+        text += (
+            f"Insgesamt sind {hochbetagte} Bewohner über 90 Jahre alt ({hochbetagte_prozent:.1f}%)."
+        )
+
+    return text
+
+
+@lru_cache(maxsize=1024)
+def betreuungsbedarf_text(stats: KategorieStatistik) -> str:
+    """Erstellt intelligente Analyse des Betreuungsbedarfs."""
+    counts = dict(stats.counts)
+    total = stats.total
+
+    hoch = counts.get("hoch", 0)
+    mittel = counts.get("mittel", 0)
+    niedrig = counts.get("niedrig", 0)
+
+    hoch_prozent = (hoch / total * 100) if total > 0 else 0
+    mittel_prozent = (mittel / total * 100) if total > 0 else 0
+    niedrig_prozent = (niedrig / total * 100) if total > 0 else 0
+
+    # Dominante Kategorie (Statistik ist bereits absteigend sortiert)
+    dominante_kategorie, dominante_anzahl = stats.counts[0]
+    dominante_prozent = (dominante_anzahl / total * 100)
+
+    text = (
+        f"Der Betreuungsbedarf verteilt sich wie folgt: {hoch} Bewohner ({hoch_prozent:.1f}%) benötigen "
+        f"einen hohen Betreuungsaufwand, {mittel} Bewohner ({mittel_prozent:.1f}%) haben einen mittleren Bedarf "
+        f"und {niedrig} Bewohner ({niedrig_prozent:.1f}%) weisen einen niedrigen Betreuungsbedarf auf. "
+    )
+
+    if dominante_kategorie == "hoch":
+        text += (
+            f"Mit {dominante_prozent:.1f}% liegt der Schwerpunkt auf Bewohnern mit hohem Betreuungsbedarf, "
+            f"was einen entsprechend hohen Personaleinsatz erfordert."
+        )
+    elif dominante_kategorie == "mittel":
+        text += (
+            f"Die Mehrheit der Bewohner ({dominante_prozent:.1f}%) weist einen mittleren Betreuungsbedarf auf, "
+            f"was eine ausgewogene Personalplanung ermöglicht."
+        )
+    else:
+        text += (
+            f"Mit {dominante_prozent:.1f}% sind die meisten Bewohner weitgehend selbstständig, "
+            f"was die Pflegeintensität insgesamt reduziert."
+        )
+
+    return text
+
+
+@lru_cache(maxsize=1024)
+def abteilungen_text(stats: KategorieStatistik) -> str:
+    """Erstellt intelligente Analyse der Abteilungsverteilung."""
+    total = stats.total
+
+    # Größte Abteilung (Statistik ist bereits absteigend sortiert)
+    groesste_abt, groesste_anzahl = stats.counts[0]
+    groesste_prozent = (groesste_anzahl / total * 100)
+
+    # Kleinste Abteilung
+    kleinste_abt, kleinste_anzahl = min(stats.counts, key=lambda abt: abt[1])
+    kleinste_prozent = (kleinste_anzahl / total * 100)
+
+    # Auslastungsanalyse
+    anzahl_abteilungen = len(stats.counts)
+    durchschnitt_pro_abt = total / anzahl_abteilungen
+
+    text = (
+        f"Die Bewohner verteilen sich auf {anzahl_abteilungen} Abteilungen. "
+        f"Die {groesste_abt} ist mit {groesste_anzahl} Bewohnern ({groesste_prozent:.1f}%) am stärksten belegt. "
+    )
+
+    text += (
+        f"Die {kleinste_abt} weist mit {kleinste_anzahl} Bewohnern ({kleinste_prozent:.1f}%) die geringste Belegung auf. "
+    )
+
+    # Gleichverteilung prüfen
+    diff_prozent = groesste_prozent - kleinste_prozent
+    if diff_prozent < 15:
+        text += (
+            f"Die Verteilung ist mit durchschnittlich {durchschnitt_pro_abt:.1f} Bewohnern pro Abteilung "
+            f"relativ ausgeglichen, was eine gleichmäßige Ressourcenverteilung begünstigt."
+        )
+    else:
+        text += (
+            f"Die Unterschiede in der Belegung sind mit einer Differenz von {diff_prozent:.1f} Prozentpunkten "
+            f"deutlich ausgeprägt."
+        )
+
+    return text
+
+
+# === Einrichtungen ===
+
+def facility_narratives(
+    summary: FacilitySummary,
+    scheme: AgeBinScheme = STANDARD_SCHEMA,
+    median: float = None,
+) -> dict:
+    """Alle Analyse-Texte einer Einrichtung; Abschnitte ohne Daten fehlen im Ergebnis."""
+    texte = {}
+
+    if summary.alter_anzahl > 0:
+        texte["Altersverteilung"] = age_text(age_statistics(summary, scheme, median))
+
+    if summary.kategorien.get("Betreuungsbedarf"):
+        texte["Betreuungsbedarf"] = betreuungsbedarf_text(category_statistics(summary, "Betreuungsbedarf"))
+
+    if summary.kategorien.get("Abteilung"):
+        texte["Abteilungen"] = abteilungen_text(category_statistics(summary, "Abteilung"))
+
+    return texte
+
+
+def batch_narratives(summaries: dict, scheme: AgeBinScheme = STANDARD_SCHEMA) -> dict:
+    """Analyse-Texte für viele Einrichtungen (Name -> Summary) ohne Zugriff auf Rohdaten."""
+    return {name: facility_narratives(summary, scheme) for name, summary in summaries.items()}
@@ -1,7 +1,21 @@
+import hashlib
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-import altair as alt
 from report_export import build_word_report
+from facility_summary import (
+    FacilitySummary,
+    age_groups,
+    category_counts,
+    merge_summaries,
+    sort_categories,
+    summarize_facility,
+    summary_kpis,
+)
+from age_binning import SCHEMATA, STANDARD_SCHEMA
+from chart_factory import bar_chart_spec
+from data_export import EXPORT_FORMATE, export_rows
 
 # === Konfiguration ===
 st.set_page_config(
@@ -10,12 +24,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# === Corporate Design ===
-BRAND_ROT = "#e2001A"
-GRAU_DUNKEL = "#333333"
-GRAU_MITTEL = "#666666"
-GRAU_HELL = "#f5f5f5"
-
 # === Custom CSS für Premium-Look ===
 st.markdown("""
 <style>
@@ -118,8 +126,12 @@ df = None
 if uploaded_file:
     try:
         df = pd.read_excel(uploaded_file)
+        datei_digest = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
         st.success("✅ Datei erfolgreich geladen und verarbeitet")
         
+        # Einmalige Aggregation – Grundlage für Diagramme und Summary-Export
+        summary = summarize_facility(df)
+        
         # === Datenvorschau (5 Zeilen) ===
         st.markdown("### 📋 Datenvorschau")
         st.dataframe(df.head(5), use_container_width=True)
@@ -174,73 +186,27 @@ if uploaded_file:
         if "Alter" in df.columns:
             st.markdown("#### 📊 Altersverteilung")
             
-            df_age = df.copy()
-            bins = [70, 75, 80, 85, 90, 95, 100]
-            labels = ["70-74", "75-79", "80-84", "85-89", "90-94", "95+"]
-            df_age["Altersgruppe"] = pd.cut(df_age["Alter"], bins=bins, labels=labels, right=False)
+            schema_namen = list(SCHEMATA)
+            schema_name = st.selectbox(
+                "Altersgruppen-Einteilung",
+                schema_namen,
+                index=schema_namen.index(STANDARD_SCHEMA.name),
+                key="age_scheme",
+            )
+            age_scheme = SCHEMATA[schema_name]
             
-            age_counts = df_age["Altersgruppe"].value_counts().sort_index().reset_index()
-            age_counts.columns = ["Altersgruppe", "Anzahl"]
+            age_result = age_groups(summary, age_scheme)
             
-            chart_age = (
-                alt.Chart(age_counts)
-                .mark_bar(
-                    color=BRAND_ROT,
-                    cornerRadiusTopLeft=8,
-                    cornerRadiusTopRight=8,
-                    opacity=0.95
-                )
-                .encode(
-                    x=alt.X(
-                        "Altersgruppe:N",
-                        title="Altersgruppe",
-                        axis=alt.Axis(
-                            labelAngle=0,
-                            labelFontSize=13,
-                            labelFontWeight=600,
-                            labelColor="#333333",
-                            titleFontSize=15,
-                            titleFontWeight="bold",
-                            titleColor="#333333",
-                            titlePadding=15,
-                            labelPadding=10,
-                            domainColor="#333333",
-                            domainWidth=2,
-                            tickColor="#333333",
-                            tickWidth=2
-                        )
-                    ),
-                    y=alt.Y(
-                        "Anzahl:Q",
-                        title="Anzahl Bewohner",
-                        axis=alt.Axis(
-                            tickMinStep=1,
-                            labelFontSize=13,
-                            labelFontWeight=600,
-                            labelColor="#333333",
-                            titleFontSize=15,
-                            titleFontWeight="bold",
-                            titleColor="#333333",
-                            titlePadding=15,
-                            grid=True,
-                            gridOpacity=0.5,
-                            gridColor="#cccccc",
-                            gridWidth=1,
-                            domainColor="#333333",
-                            domainWidth=2,
-                            tickColor="#333333",
-                            tickWidth=2
-                        )
-                    ),
-                    tooltip=[
-                        alt.Tooltip("Altersgruppe:N", title="Altersgruppe"),
-                        alt.Tooltip("Anzahl:Q", title="Anzahl Bewohner")
-                    ]
+            if age_result.underflow or age_result.overflow:
+                st.caption(
+                    f"Außerhalb der Altersgruppen: {age_result.underflow} Bewohner unter "
+                    f"{age_scheme.edges[0]} Jahren, {age_result.overflow} ab {age_scheme.edges[-1]} Jahren"
                 )
-                .properties(height=450)
-                .configure_view(strokeWidth=0)
+            
+            chart_age = bar_chart_spec(
+                age_result.as_series(), "Altersgruppe", "Anzahl Bewohner", height=450, daten_reihenfolge=True
             )
-            st.altair_chart(chart_age, use_container_width=True)
+            st.vega_lite_chart(chart_age, use_container_width=True)
         
         # === Zwei Charts nebeneinander ===
         col_left, col_right = st.columns(2)
@@ -250,137 +216,20 @@ if uploaded_file:
             if "Betreuungsbedarf" in df.columns:
                 st.markdown("#### 🧠 Betreuungsbedarf")
                 
-                bedarf_counts = df["Betreuungsbedarf"].value_counts().reset_index()
-                bedarf_counts.columns = ["Betreuungsbedarf", "Anzahl"]
-                
-                chart_bedarf = (
-                    alt.Chart(bedarf_counts)
-                    .mark_bar(
-                        color=BRAND_ROT,
-                        cornerRadiusTopLeft=8,
-                        cornerRadiusTopRight=8,
-                        opacity=0.95
-                    )
-                    .encode(
-                        x=alt.X(
-                            "Betreuungsbedarf:N",
-                            title="Betreuungsbedarf",
-                            axis=alt.Axis(
-                                labelAngle=0,
-                                labelFontSize=13,
-                                labelFontWeight=600,
-                                labelColor="#333333",
-                                titleFontSize=15,
-                                titleFontWeight="bold",
-                                titleColor="#333333",
-                                titlePadding=15,
-                                labelPadding=10,
-                                domainColor="#333333",
-                                domainWidth=2,
-                                tickColor="#333333",
-                                tickWidth=2
-                            )
-                        ),
-                        y=alt.Y(
-                            "Anzahl:Q",
-                            title="Anzahl",
-                            axis=alt.Axis(
-                                tickMinStep=1,
-                                labelFontSize=13,
-                                labelFontWeight=600,
-                                labelColor="#333333",
-                                titleFontSize=15,
-                                titleFontWeight="bold",
-                                titleColor="#333333",
-                                titlePadding=15,
-                                grid=True,
-                                gridOpacity=0.5,
-                                gridColor="#cccccc",
-                                gridWidth=1,
-                                domainColor="#333333",
-                                domainWidth=2,
-                                tickColor="#333333",
-                                tickWidth=2
-                            )
-                        ),
-                        tooltip=[
-                            alt.Tooltip("Betreuungsbedarf:N", title="Betreuungsbedarf"),
-                            alt.Tooltip("Anzahl:Q", title="Anzahl")
-                        ]
-                    )
-                    .properties(height=400)
-                    .configure_view(strokeWidth=0)
-                )
-                st.altair_chart(chart_bedarf, use_container_width=True)
+                bedarf_counts = sort_categories(category_counts(summary, "Betreuungsbedarf"))
+                chart_bedarf = bar_chart_spec(bedarf_counts, "Betreuungsbedarf", daten_reihenfolge=True)
+                st.vega_lite_chart(chart_bedarf, use_container_width=True)
         
         # === Abteilungen ===
         with col_right:
             if "Abteilung" in df.columns:
                 st.markdown("#### 🏥 Abteilungen")
                 
-                abt_counts = df["Abteilung"].value_counts().reset_index()
-                abt_counts.columns = ["Abteilung", "Anzahl"]
-                
-                chart_abt = (
-                    alt.Chart(abt_counts)
-                    .mark_bar(
-                        color=BRAND_ROT,
-                        cornerRadiusTopLeft=8,
-                        cornerRadiusTopRight=8,
-                        opacity=0.95
-                    )
-                    .encode(
-                        x=alt.X(
-                            "Abteilung:N",
-                            title="Abteilung",
-                            axis=alt.Axis(
-                                labelAngle=0,
-                                labelFontSize=12,
-                                labelFontWeight=600,
-                                labelColor="#333333",
-                                titleFontSize=15,
-                                titleFontWeight="bold",
-                                titleColor="#333333",
-                                titlePadding=15,
-                                labelPadding=10,
-                                labelLimit=120,
-                                domainColor="#333333",
-                                domainWidth=2,
-                                tickColor="#333333",
-                                tickWidth=2
-                            )
-                        ),
-                        y=alt.Y(
-                            "Anzahl:Q",
-                            title="Anzahl",
-                            axis=alt.Axis(
-                                tickMinStep=1,
-                                labelFontSize=13,
-                                labelFontWeight=600,
-                                labelColor="#333333",
-                                titleFontSize=15,
-                                titleFontWeight="bold",
-                                titleColor="#333333",
-                                titlePadding=15,
-                                grid=True,
-                                gridOpacity=0.5,
-                                gridColor="#cccccc",
-                                gridWidth=1,
-                                domainColor="#333333",
-                                domainWidth=2,
-                                tickColor="#333333",
-                                tickWidth=2
-                            )
-                        ),
-                        tooltip=[
-                            alt.Tooltip("Abteilung:N", title="Abteilung"),
-                            alt.Tooltip("Anzahl:Q", title="Anzahl")
-                        ]
-                    )
-                    .properties(height=400)
-                    .configure_view(strokeWidth=0)
+                abt_counts = sort_categories(category_counts(summary, "Abteilung"))
+                chart_abt = bar_chart_spec(
+                    abt_counts, "Abteilung", label_font_size=12, label_limit=120, daten_reihenfolge=True
                 )
-                st.altair_chart(chart_abt, use_container_width=True)
+                st.vega_lite_chart(chart_abt, use_container_width=True)
         
         st.markdown("---")
         
@@ -393,15 +242,46 @@ if uploaded_file:
         
         col_filter1, col_filter2 = st.columns([1, 3])
         
+        show_einzelzimmer = False
+        filter_mask = None
+        
         with col_filter1:
             if "Einzelzimmer" in df.columns:
                 show_einzelzimmer = st.checkbox("🛏️ Nur Einzelzimmer", key="filter_single_room")
         
         with col_filter2:
             if show_einzelzimmer:
-                df_filtered = df[df["Einzelzimmer"] == "Ja"]
-                st.info(f"📊 Gefiltert: {len(df_filtered)} von {len(df)} Bewohnern in Einzelzimmern")
-                st.dataframe(df_filtered, use_container_width=True, height=300)
+                filter_mask = (df["Einzelzimmer"] == "Ja").to_numpy()
+                st.info(f"📊 Gefiltert: {int(filter_mask.sum())} von {len(df)} Bewohnern in Einzelzimmern")
+                st.dataframe(df[filter_mask], use_container_width=True, height=300)
+        
+        # === Export der (gefilterten) Bewohnerliste ===
+        col_format, col_download = st.columns([1, 3])
+        
+        with col_format:
+            export_format = st.selectbox("Format", list(EXPORT_FORMATE), key="filter_export_format")
+        
+        with col_download:
+            # Export erst auf Klick erstellen; je Sitzung wird nur die zuletzt erstellte
+            # Datei gehalten und nur angeboten, solange Datei, Format und Filter passen.
+            _, endung, mime = EXPORT_FORMATE[export_format]
+            filter_digest = "alle" if filter_mask is None else hashlib.sha1(np.packbits(filter_mask).tobytes()).hexdigest()
+            export_key = (datei_digest, export_format, filter_digest)
+            
+            if st.button("⚙️ Export erstellen", key="build_filtered_rows"):
+                st.session_state["filter_export"] = (export_key, export_rows(df, export_format, mask=filter_mask))
+            
+            gespeichert = st.session_state.get("filter_export")
+            if gespeichert is not None and gespeichert[0] == export_key:
+                st.download_button(
+                    label="📥 Bewohnerliste herunterladen" + (" (gefiltert)" if filter_mask is not None else ""),
+                    data=gespeichert[1],
+                    file_name=f"pflegeheim_bewohner.{endung}",
+                    mime=mime,
+                    key="download_filtered_rows",
+                )
+            else:
+                st.session_state.pop("filter_export", None)
         
         st.markdown("---")
         
@@ -409,7 +289,8 @@ if uploaded_file:
         st.markdown("### 📥 Export")
         
         if df is not None and not df.empty:
-            word_bytes = build_word_report(df)
+            age_scheme = SCHEMATA.get(st.session_state.get("age_scheme"), STANDARD_SCHEMA)
+            word_bytes = build_word_report(df, age_scheme, summary=summary)
             st.download_button(
                 label="📄 Grafikreport als Word herunterladen",
                 data=word_bytes,
@@ -417,9 +298,96 @@ if uploaded_file:
                 mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                 key="download_word_report",
             )
+            
+            # Mergebare Kurzfassung für die Konsolidierung auf Trägerebene
+            summary_json = summary.to_json()
+            st.download_button(
+                label="🧮 Kennzahlen-Summary (JSON) herunterladen",
+                data=summary_json,
+                file_name="pflegeheim_summary.json",
+                mime="application/json",
+                key="download_summary_json",
+            )
     
     except Exception as e:
         st.error(f"❌ Fehler beim Verarbeiten der Datei: {e}")
 
 else:
     st.info("👆 Bitte laden Sie eine Excel-Datei hoch, um die Analyse zu starten")
+
+# === Konsolidierung mehrerer Einrichtungen ===
+with st.expander("🏢 Mehrere Einrichtungen zusammenführen (Kennzahlen-Summaries)"):
+    summary_files = st.file_uploader(
+        "Kennzahlen-Summaries (JSON) mehrerer Einrichtungen auswählen",
+        type=["json"],
+        accept_multiple_files=True,
+        key="file_upload_summaries",
+    )
+    
+    if summary_files:
+        try:
+            gesamt = merge_summaries(
+                FacilitySummary.from_json(f.getvalue().decode("utf-8")) for f in summary_files
+            )
+            kpis = summary_kpis(gesamt)
+            
+            st.success(f"✅ {len(summary_files)} Einrichtungen zusammengeführt")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric(label="👥 Bewohner gesamt", value=f"{kpis['bewohner_gesamt']}")
+            with col2:
+                st.metric(
+                    label="📅 Durchschnittsalter",
+                    value=f"{kpis['durchschnittsalter']:.1f} Jahre",
+                    delta=f"Median {kpis['median_alter']:.1f}",
+                    delta_color="off",
+                )
+            with col3:
+                st.metric(
+                    label="🔴 Hoher Betreuungsbedarf",
+                    value=f"{kpis['hoher_bedarf']}",
+                    delta=f"{kpis['hoher_bedarf_anteil']:.1f}%"
+                )
+            with col4:
+                st.metric(
+                    label="🛏️ Einzelzimmer",
+                    value=f"{kpis['einzelzimmer']}",
+                    delta=f"{kpis['einzelzimmer_anteil']:.1f}%"
+                )
+            
+            # Gleiche Altersgruppen-Einteilung wie im Einzel-Dashboard
+            konsolidierung_schema = SCHEMATA.get(st.session_state.get("age_scheme"), STANDARD_SCHEMA)
+            st.vega_lite_chart(
+                bar_chart_spec(
+                    age_groups(gesamt, konsolidierung_schema).as_series(), "Altersgruppe", "Anzahl Bewohner", height=400, daten_reihenfolge=True
+                ),
+                use_container_width=True,
+            )
+            
+            col_left, col_right = st.columns(2)
+            with col_left:
+                if gesamt.kategorien.get("Betreuungsbedarf"):
+                    st.vega_lite_chart(
+                        bar_chart_spec(
+                            sort_categories(category_counts(gesamt, "Betreuungsbedarf")),
+                            "Betreuungsbedarf",
+                            daten_reihenfolge=True,
+                        ),
+                        use_container_width=True,
+                    )
+            with col_right:
+                if gesamt.kategorien.get("Abteilung"):
+                    st.vega_lite_chart(
+                        bar_chart_spec(
+                            sort_categories(category_counts(gesamt, "Abteilung")),
+                            "Abteilung",
+                            label_font_size=12,
+                            label_limit=120,
+                            daten_reihenfolge=True,
+                        ),
+                        use_container_width=True,
+                    )
+        
+        except Exception as e:
+            st.error(f"❌ Fehler beim Zusammenführen der Summaries: {e}")
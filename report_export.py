@@ -6,18 +6,17 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
-# === Corporate Design ===
-BRAND_ROT = "#e2001A"
-GRAU_DUNKEL = "#333333"
+from age_binning import AgeBinScheme, STANDARD_SCHEMA
+from facility_summary import FacilitySummary, age_groups, category_counts, sort_categories, summarize_facility
+from narrative import facility_narratives
+from corporate_design import BRAND_ROT, GRAU_DUNKEL, GRID_GRAU
 
 # === Diagramm-Einstellungen (hier kannst du die Größe anpassen) ===
 DIAGRAMM_BREITE_INCHES = 3.8  # Breite der Diagramme in Inches (Standard: 5.0)
 
 
-def _make_bar_image(series: pd.Series, title: str, xlabel: str, ylabel: str = "Anzahl") -> BytesIO:
-    """Erstellt ein Balkendiagramm im Corporate Design."""
-    counts = series.value_counts().sort_index()
-    
+def _make_counts_image(counts: pd.Series, title: str, xlabel: str, ylabel: str = "Anzahl") -> BytesIO:
+    """Erstellt ein Balkendiagramm im Corporate Design aus bereits gezählten Werten."""
     fig, ax = plt.subplots(figsize=(8, 5))
     
     # Balken mit AWO-Rot
@@ -49,7 +48,7 @@ def _make_bar_image(series: pd.Series, title: str, xlabel: str, ylabel: str = "A
     ax.tick_params(axis='both', which='major', labelsize=11, width=2, color=GRAU_DUNKEL, labelcolor=GRAU_DUNKEL)
     
     # Grid mit besserer Sichtbarkeit
-    ax.yaxis.grid(True, linestyle='-', alpha=0.5, color='#cccccc', linewidth=1)
+    ax.yaxis.grid(True, linestyle='-', alpha=0.5, color=GRID_GRAU, linewidth=1)
     ax.set_axisbelow(True)
     
     # X-Achsen-Labels gerade
@@ -65,163 +64,34 @@ def _make_bar_image(series: pd.Series, title: str, xlabel: str, ylabel: str = "A
     return buf
 
 
-def _make_age_group_image(df: pd.DataFrame) -> BytesIO:
-    """Erstellt Altersgruppen-Diagramm (70-74, 75-79, etc.)."""
-    df_age = df.copy()
-    bins = [70, 75, 80, 85, 90, 95, 100]
-    labels = ["70-74", "75-79", "80-84", "85-89", "90-94", "95+"]
-    df_age["Altersgruppe"] = pd.cut(df_age["Alter"], bins=bins, labels=labels, right=False)
-    
-    # Series für _make_bar_image erstellen
-    age_series = df_age["Altersgruppe"].dropna()
-    
-    return _make_bar_image(age_series, "Altersverteilung", "Altersgruppe", "Anzahl Bewohner")
-
-
-def _analyze_age_distribution(df: pd.DataFrame) -> str:
-    """Erstellt intelligente Analyse der Altersverteilung."""
-    df_age = df.copy()
-    bins = [70, 75, 80, 85, 90, 95, 100]
-    labels = ["70-74", "75-79", "80-84", "85-89", "90-94", "95+"]
-    df_age["Altersgruppe"] = pd.cut(df_age["Alter"], bins=bins, labels=labels, right=False)
-    
-    counts = df_age["Altersgruppe"].value_counts()
-    total = len(df_age)
-    durchschnitt = df["Alter"].mean()
-    median = df["Alter"].median()
-    
-    # Größte Gruppe
-    groesste_gruppe = counts.idxmax()
-    groesste_anzahl = counts.max()
-    groesste_prozent = (groesste_anzahl / total * 100)
-    
-    # Zweitgrößte Gruppe
-    counts_sorted = counts.sort_values(ascending=False)
-    zweitgroesste_gruppe = counts_sorted.index[1] if len(counts_sorted) > 1 else None
-    zweitgroesste_anzahl = counts_sorted.iloc[1] if len(counts_sorted) > 1 else 0
-    
-    # Hochbetagte (90+)
-    hochbetagte = len(df_age[df_age["Alter"] >= 90])
-    hochbetagte_prozent = (hochbetagte / total * 100) if total > 0 else 0
+def _make_age_group_image(summary: FacilitySummary, scheme: AgeBinScheme = STANDARD_SCHEMA) -> BytesIO:
+    """Erstellt das Altersgruppen-Diagramm nach dem gewählten Klassenschema."""
+    counts = age_groups(summary, scheme).as_series()
     
-    text = (
-        f"Die am stärksten vertretene Altersgruppe ist {groesste_gruppe} Jahre mit {groesste_anzahl} Bewohnern "
-        f"({groesste_prozent:.1f}% aller Bewohner). "
-    )
-    
-    if zweitgroesste_gruppe:
-        text += (
-            f"Darauf folgt die Altersgruppe {zweitgroesste_gruppe} Jahre mit {zweitgroesste_anzahl} Bewohnern. "
-        )
-    
-    text += (
-        f"Das Durchschnittsalter beträgt {durchschnitt:.1f} Jahre, der Median liegt bei {median:.1f} Jahren. "
-    )
-    
-    if hochbetagte_prozent > 20:
-        text += (
-            f"Mit {hochbetagte} Bewohnern über 90 Jahren ({hochbetagte_prozent:.1f}%) zeigt sich ein hoher Anteil "
-            f"hochbetagter Personen, was besondere Anforderungen an die Pflege stellt."
-        )
-    elif hochbetagte > 0:
-        text += (
-            f"Insgesamt sind {hochbetagte} Bewohner über 90 Jahre alt ({hochbetagte_prozent:.1f}%)."
-        )
-    
-    return text
+    return _make_counts_image(counts, "Altersverteilung", "Altersgruppe", "Anzahl Bewohner")
 
 
-def _analyze_betreuungsbedarf(df: pd.DataFrame) -> str:
-    """Erstellt intelligente Analyse des Betreuungsbedarfs."""
-    counts = df["Betreuungsbedarf"].value_counts()
-    total = len(df)
-    
-    hoch = counts.get("hoch", 0)
-    mittel = counts.get("mittel", 0)
-    niedrig = counts.get("niedrig", 0)
-    
-    hoch_prozent = (hoch / total * 100) if total > 0 else 0
-    mittel_prozent = (mittel / total * 100) if total > 0 else 0
-    niedrig_prozent = (niedrig / total * 100) if total > 0 else 0
-    
-    # Dominante Kategorie
-    dominante_kategorie = counts.idxmax()
-    dominante_anzahl = counts.max()
-    dominante_prozent = (dominante_anzahl / total * 100)
+def build_word_report(
+    df: pd.DataFrame,
+    age_scheme: AgeBinScheme = STANDARD_SCHEMA,
+    summary: FacilitySummary = None,
+) -> BytesIO:
+    """Erzeugt einen Word-Report mit den Grafiken im Corporate Design.
     
-    text = (
-        f"Der Betreuungsbedarf verteilt sich wie folgt: {hoch} Bewohner ({hoch_prozent:.1f}%) benötigen "
-        f"einen hohen Betreuungsaufwand, {mittel} Bewohner ({mittel_prozent:.1f}%) haben einen mittleren Bedarf "
-        f"und {niedrig} Bewohner ({niedrig_prozent:.1f}%) weisen einen niedrigen Betreuungsbedarf auf. "
-    )
-    
-    if dominante_kategorie == "hoch":
-        text += (
-            f"Mit {dominante_prozent:.1f}% liegt der Schwerpunkt auf Bewohnern mit hohem Betreuungsbedarf, "
-            f"was einen entsprechend hohen Personaleinsatz erfordert."
-        )
-    elif dominante_kategorie == "mittel":
-        text += (
-            f"Die Mehrheit der Bewohner ({dominante_prozent:.1f}%) weist einen mittleren Betreuungsbedarf auf, "
-            f"was eine ausgewogene Personalplanung ermöglicht."
-        )
-    else:
-        text += (
-            f"Mit {dominante_prozent:.1f}% sind die meisten Bewohner weitgehend selbstständig, "
-            f"was die Pflegeintensität insgesamt reduziert."
-        )
-    
-    return text
-
-
-def _analyze_abteilungen(df: pd.DataFrame) -> str:
-    """Erstellt intelligente Analyse der Abteilungsverteilung."""
-    counts = df["Abteilung"].value_counts()
-    total = len(df)
-    
-    # Größte Abteilung
-    groesste_abt = counts.idxmax()
-    groesste_anzahl = counts.max()
-    groesste_prozent = (groesste_anzahl / total * 100)
-    
-    # Kleinste Abteilung
-    kleinste_abt = counts.idxmin()
-    kleinste_anzahl = counts.min()
-    kleinste_prozent = (kleinste_anzahl / total * 100)
-    
-    # Auslastungsanalyse
-    anzahl_abteilungen = len(counts)
-    durchschnitt_pro_abt = total / anzahl_abteilungen
-    
-    text = (
-        f"Die Bewohner verteilen sich auf {anzahl_abteilungen} Abteilungen. "
-        f"Die {groesste_abt} ist mit {groesste_anzahl} Bewohnern ({groesste_prozent:.1f}%) am stärksten belegt. "
-    )
-    
-    text += (
-        f"Die {kleinste_abt} weist mit {kleinste_anzahl} Bewohnern ({kleinste_prozent:.1f}%) die geringste Belegung auf. "
-    )
-    
-    # Gleichverteilung prüfen
-    diff_prozent = groesste_prozent - kleinste_prozent
-    if diff_prozent < 15:
-        text += (
-            f"Die Verteilung ist mit durchschnittlich {durchschnitt_pro_abt:.1f} Bewohnern pro Abteilung "
-            f"relativ ausgeglichen, was eine gleichmäßige Ressourcenverteilung begünstigt."
-        )
-    else:
-        text += (
-            f"Die Unterschiede in der Belegung sind mit einer Differenz von {diff_prozent:.1f} Prozentpunkten "
-            f"deutlich ausgeprägt."
-        )
-    
-    return text
-
-
-def build_word_report(df: pd.DataFrame) -> BytesIO:
-    """Erzeugt einen Word-Report mit den Grafiken im Corporate Design."""
+    Eine bereits berechnete ``summary`` kann übergeben werden, um die Aggregation nicht zu wiederholen.
+    """
     doc = Document()
     
+    # Einmalige Aggregation – Grundlage für Analyse-Texte und Diagramme
+    if summary is None:
+        summary = summarize_facility(df)
+    # Bei ganzzahligen Altersangaben ist der Histogramm-Median exakt; nur sonst
+    # wird der Median aus den Rohdaten gelesen.
+    median = None
+    if not summary.alter_ganzzahlig and "Alter" in df.columns:
+        median = df["Alter"].median()
+    analysen = facility_narratives(summary, age_scheme, median=median)
+    
     # === Titel mit Corporate Design ===
     title = doc.add_heading("Pflegeheim – Datenanalyse", 0)
     title_run = title.runs[0]
@@ -277,12 +147,11 @@ def build_word_report(df: pd.DataFrame) -> BytesIO:
             run.font.color.rgb = RGBColor(226, 0, 26)
         
         # Analyse-Text
-        analyse_text = _analyze_age_distribution(df)
-        doc.add_paragraph(analyse_text)
+        doc.add_paragraph(analysen.get("Altersverteilung", ""))
         doc.add_paragraph()  # Leerzeile
         
         # Diagramm
-        img = _make_age_group_image(df)
+        img = _make_age_group_image(summary, age_scheme)
         doc.add_picture(img, width=Inches(DIAGRAMM_BREITE_INCHES))
         doc.add_paragraph()  # Leerzeile
     
@@ -293,12 +162,12 @@ def build_word_report(df: pd.DataFrame) -> BytesIO:
             run.font.color.rgb = RGBColor(226, 0, 26)
         
         # Analyse-Text
-        analyse_text = _analyze_betreuungsbedarf(df)
-        doc.add_paragraph(analyse_text)
+        doc.add_paragraph(analysen.get("Betreuungsbedarf", ""))
         doc.add_paragraph()  # Leerzeile
         
         # Diagramm
-        img = _make_bar_image(df["Betreuungsbedarf"], "Verteilung Betreuungsbedarf", "Betreuungsbedarf", "Anzahl")
+        counts = sort_categories(category_counts(summary, "Betreuungsbedarf"))
+        img = _make_counts_image(counts, "Verteilung Betreuungsbedarf", "Betreuungsbedarf", "Anzahl")
         doc.add_picture(img, width=Inches(DIAGRAMM_BREITE_INCHES))
         doc.add_paragraph()  # Leerzeile
     
@@ -309,12 +178,12 @@ def build_word_report(df: pd.DataFrame) -> BytesIO:
             run.font.color.rgb = RGBColor(226, 0, 26)
         
         # Analyse-Text
-        analyse_text = _analyze_abteilungen(df)
-        doc.add_paragraph(analyse_text)
+        doc.add_paragraph(analysen.get("Abteilungen", ""))
         doc.add_paragraph()  # Leerzeile
         
         # Diagramm
-        img = _make_bar_image(df["Abteilung"], "Verteilung nach Abteilungen", "Abteilung", "Anzahl")
+        counts = sort_categories(category_counts(summary, "Abteilung"))
+        img = _make_counts_image(counts, "Verteilung nach Abteilungen", "Abteilung", "Anzahl")
         doc.add_picture(img, width=Inches(DIAGRAMM_BREITE_INCHES))
         doc.add_paragraph()  # Leerzeile
     
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from age_binning import SCHEMATA, AgeBinScheme, bin_ages, make_scheme
+from facility_summary import age_groups, summarize_facility
+
+
+@pytest.fixture
+def alter():
+    rng = np.random.default_rng(11)
+    werte = rng.integers(50, 110, size=2000).astype(float)
+    werte[::97] = np.nan
+    return pd.Series(werte, name="Alter")
+
+
+@pytest.mark.parametrize("scheme", list(SCHEMATA.values()), ids=list(SCHEMATA))
+def test_matches_pd_cut(alter, scheme):
+    result = bin_ages(alter, scheme)
+
+    erwartet = pd.cut(alter, bins=list(scheme.edges), labels=list(scheme.labels), right=False)
+    erwartet = erwartet.value_counts(sort=False).reindex(list(scheme.labels))
+
+    assert result.counts.tolist() == erwartet.tolist()
+    assert result.total + result.underflow + result.overflow + result.missing == len(alter)
+
+
+def test_under_overflow_and_missing():
+    scheme = make_scheme([70, 80, 90])
+    result = bin_ages([69.9, 70, 79.99, 80, 89.9, 90, 120, np.nan, np.nan], scheme)
+
+    assert result.counts.tolist() == [2, 2]
+    assert result.underflow == 1
+    assert result.overflow == 2
+    assert result.missing == 2
+    assert result.as_series().index.tolist() == ["70-79", "80+"]
+
+
+def test_weights_rebin_histogram(alter):
+    scheme = SCHEMATA["10-Jahres-Gruppen"]
+    klassen = np.arange(0, 130)
+    histogramm = np.bincount(alter.dropna().astype(int), minlength=130)
+
+    result = bin_ages(klassen, scheme, weights=histogramm)
+    direkt = bin_ages(alter, scheme)
+
+    assert result.counts.dtype == np.int64
+    assert result.counts.tolist() == direkt.counts.tolist()
+    assert result.underflow == direkt.underflow
+    assert result.overflow == direkt.overflow
+
+
+@pytest.mark.parametrize("edges, labels", [
+    ([70], None),
+    ([70, 70, 80], ["a", "b"]),
+    ([80, 70, 90], ["a", "b"]),
+    ([70, 80, 90], ["nur eins"]),
+])
+def test_rejects_bad_schemes(edges, labels):
+    with pytest.raises(ValueError):
+        AgeBinScheme(name="kaputt", edges=tuple(edges), labels=tuple(labels or ()))
+
+
+@pytest.mark.parametrize("edges", [[62.5, 77.5, 92.5], [70, 100, 140]])
+def test_age_groups_rejects_edges_not_on_histogram(alter, edges):
+    summary = summarize_facility(alter.to_frame())
+
+    with pytest.raises(ValueError):
+        age_groups(summary, make_scheme(edges))
+    # Auf den Rohdaten funktioniert das gleiche Schema
+    assert bin_ages(alter, make_scheme(edges)).total > 0
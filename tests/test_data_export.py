@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_export import export_rows
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "Alter": [81.5, np.nan, 92.0, 77.0],
+        "Name": ["A", "B", None, "D"],
+        "Einzelzimmer": ["Ja", "Nein", "Ja", "Ja"],
+        "Aufnahme": pd.to_datetime(["2023-01-05", None, "2021-07-30", "2024-03-01"]),
+    })
+
+
+def _lesen(format_name: str, daten: bytes) -> pd.DataFrame:
+    if format_name == "Excel (.xlsx)":
+        return pd.read_excel(BytesIO(daten))
+    if format_name == "CSV":
+        return pd.read_csv(BytesIO(daten), sep=";", decimal=",", encoding="utf-8-sig", parse_dates=["Aufnahme"])
+    return pd.read_parquet(BytesIO(daten))
+
+
+FORMATE = ["Excel (.xlsx)", "CSV", "Parquet"]
+
+
+@pytest.mark.parametrize("format_name", FORMATE)
+def test_round_trip_with_mask(df, format_name):
+    mask = (df["Einzelzimmer"] == "Ja").to_numpy()
+
+    gelesen = _lesen(format_name, export_rows(df, format_name, mask=mask))
+    erwartet = df[mask].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(gelesen, erwartet, check_dtype=False)
+
+
+@pytest.mark.parametrize("format_name", FORMATE)
+def test_round_trip_with_nan_and_nat(df, format_name):
+    gelesen = _lesen(format_name, export_rows(df, format_name))
+
+    assert gelesen["Alter"].isna().tolist() == [False, True, False, False]
+    assert gelesen["Name"].isna().tolist() == [False, False, True, False]
+    assert gelesen["Aufnahme"].isna().tolist() == [False, True, False, False]
+    assert gelesen["Alter"].iloc[0] == pytest.approx(81.5)
+
+
+@pytest.mark.parametrize("format_name", FORMATE)
+def test_all_false_mask_writes_header_only(df, format_name):
+    gelesen = _lesen(format_name, export_rows(df, format_name, mask=np.zeros(len(df), dtype=bool)))
+
+    assert list(gelesen.columns) == list(df.columns)
+    assert len(gelesen) == 0
+
+
+def test_csv_uses_decimal_comma(df):
+    text = export_rows(df, "CSV").decode("utf-8-sig")
+
+    assert "81,5;" in text
+    assert "81.5" not in text
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from facility_summary import (
+    ALTER_KLASSEN,
+    ALTER_MAX,
+    FacilitySummary,
+    age_at_least,
+    age_groups,
+    age_mean,
+    age_median,
+    age_quantile,
+    category_counts,
+    merge_summaries,
+    sort_categories,
+    summarize_facility,
+)
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(42)
+    n = 200
+    return pd.DataFrame({
+        "Alter": rng.integers(68, 103, size=n),
+        "Betreuungsbedarf": rng.choice(["hoch", "mittel", "niedrig"], size=n),
+        "Abteilung": rng.choice(["Wohnbereich A", "Wohnbereich B", "Wohnbereich C"], size=n),
+        "Einzelzimmer": rng.choice(["Ja", "Nein"], size=n),
+    })
+
+
+def test_merge_of_split_frames_equals_whole(df):
+    teile = [df.iloc[:50], df.iloc[50:120], df.iloc[120:]]
+    merged = merge_summaries(summarize_facility(teil) for teil in teile)
+
+    assert merged == summarize_facility(df)
+
+
+def test_json_round_trip(df):
+    summary = summarize_facility(df)
+
+    assert FacilitySummary.from_json(summary.to_json()) == summary
+
+
+def test_from_dict_rejects_wrong_histogram_length(df):
+    data = summarize_facility(df).to_dict()
+    data["alter"]["histogramm"] = data["alter"]["histogramm"][:-1]
+
+    with pytest.raises(ValueError):
+        FacilitySummary.from_dict(data)
+
+
+@pytest.mark.parametrize("q", [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0])
+def test_quantiles_match_pandas_for_integer_ages(df, q):
+    summary = summarize_facility(df)
+
+    assert age_quantile(summary, q) == pytest.approx(df["Alter"].quantile(q))
+
+
+def test_median_and_mean_match_pandas(df):
+    summary = summarize_facility(df)
+
+    assert age_median(summary) == pytest.approx(df["Alter"].median())
+    assert age_mean(summary) == pytest.approx(df["Alter"].mean())
+
+
+def test_fractional_median_is_interpolated_within_bin():
+    rng = np.random.default_rng(7)
+    alter = pd.Series(rng.uniform(70, 100, size=501))
+    summary = summarize_facility(pd.DataFrame({"Alter": alter}))
+
+    assert not summary.alter_ganzzahlig
+    assert abs(age_median(summary) - alter.median()) < 0.5
+
+
+def test_under_and_overflow():
+    df = pd.DataFrame({"Alter": [-3, 65, 72, 99, 100, 135, np.nan]})
+    summary = summarize_facility(df)
+
+    assert summary.anzahl == 7
+    assert summary.alter_anzahl == 6
+    assert summary.alter_unterlauf == 1
+    assert summary.alter_ueberlauf == 1
+    assert summary.alter_histogramm.sum() == 4
+    assert age_at_least(summary, 90) == 3
+
+    gruppen = age_groups(summary)
+    assert gruppen.counts.tolist() == [1, 0, 0, 0, 0, 1]
+    assert gruppen.underflow == 2  # -3 und 65
+    assert gruppen.overflow == 2  # 100 und 135
+
+    assert age_quantile(summary, 0.0) == 0
+    assert age_quantile(summary, 1.0) == ALTER_MAX
+
+
+def test_histogram_has_fixed_size():
+    assert summarize_facility(pd.DataFrame({"Alter": [80]})).alter_histogramm.shape == (ALTER_KLASSEN,)
+
+
+def test_equality_tolerates_float_sum_order():
+    rng = np.random.default_rng(3)
+    teile = [pd.DataFrame({"Alter": rng.uniform(70, 100, size=37)}) for _ in range(5)]
+    summaries = [summarize_facility(teil) for teil in teile]
+
+    vorwaerts = merge_summaries(summaries)
+    rueckwaerts = merge_summaries(reversed(summaries))
+
+    assert vorwaerts == rueckwaerts
+
+
+def test_sort_categories_orders_numeric_codes_numerically():
+    summary = summarize_facility(pd.DataFrame({"Abteilung": [10, 2, 2, 1, 10, 10]}))
+
+    assert sort_categories(category_counts(summary, "Abteilung")).index.tolist() == ["1", "2", "10"]
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from facility_summary import FacilitySummary, summarize_facility
+from narrative import batch_narratives, facility_narratives
+
+# Erwartete Texte wurden mit den früheren DataFrame-basierten
+# _analyze_*-Funktionen aus report_export.py erzeugt.
+FAELLE = {
+    # Gleichstände in Altersgruppen, Betreuungsbedarf und Abteilungen; ein fehlendes Alter
+    "gleichstand": (
+        pd.DataFrame({
+            "Alter": [71, 72, 76, 77, 83, 91, np.nan, 96],
+            "Betreuungsbedarf": ["hoch", "mittel", "hoch", "mittel", "niedrig", "niedrig", "hoch", "mittel"],
+            "Abteilung": [
+                "Wohnbereich A", "Wohnbereich B", "Wohnbereich A", "Wohnbereich B",
+                "Wohnbereich C", "Wohnbereich C", "Wohnbereich A", "Wohnbereich B",
+            ],
+        }),
+        {
+            "Altersverteilung": (
+                "Die am stärksten vertretene Altersgruppe ist 70-74 Jahre mit 2 Bewohnern (25.0% aller Bewohner). "
+                "Darauf folgt die Altersgruppe 75-79 Jahre mit 2 Bewohnern. "
+                "Das Durchschnittsalter beträgt 80.9 Jahre, der Median liegt bei 77.0 Jahren. "
+                "Mit 2 Bewohnern über 90 Jahren (25.0%) zeigt sich ein hoher Anteil hochbetagter Personen, "
+                "was besondere Anforderungen an die Pflege stellt."
+            ),
+            "Betreuungsbedarf": (
+                "Der Betreuungsbedarf verteilt sich wie folgt: 3 Bewohner (37.5%) benötigen einen hohen "
+                "Betreuungsaufwand, 3 Bewohner (37.5%) haben einen mittleren Bedarf und 2 Bewohner (25.0%) weisen "
+                "einen niedrigen Betreuungsbedarf auf. Mit 37.5% liegt der Schwerpunkt auf Bewohnern mit hohem "
+                "Betreuungsbedarf, was einen entsprechend hohen Personaleinsatz erfordert."
+            ),
+            "Abteilungen": (
+                "Die Bewohner verteilen sich auf 3 Abteilungen. Die Wohnbereich A ist mit 3 Bewohnern (37.5%) am "
+                "stärksten belegt. Die Wohnbereich C weist mit 2 Bewohnern (25.0%) die geringste Belegung auf. "
+                "Die Verteilung ist mit durchschnittlich 2.7 Bewohnern pro Abteilung relativ ausgeglichen, was eine "
+                "gleichmäßige Ressourcenverteilung begünstigt."
+            ),
+        },
+    ),
+    # Viele Hochbetagte (inkl. über 100), deutliche Belegungsunterschiede; ein fehlendes Alter
+    "hochbetagt": (
+        pd.DataFrame({
+            "Alter": [88, 90, 91, 92, 95, 97, 99, 101, 84, np.nan],
+            "Betreuungsbedarf": ["niedrig"] * 6 + ["hoch"] * 2 + ["mittel"] * 2,
+            "Abteilung": ["Station 1"] * 7 + ["Station 2"] * 2 + ["Station 3"],
+        }),
+        {
+            "Altersverteilung": (
+                "Die am stärksten vertretene Altersgruppe ist 90-94 Jahre mit 3 Bewohnern (30.0% aller Bewohner). "
+                "Darauf folgt die Altersgruppe 95+ Jahre mit 3 Bewohnern. "
+                "Das Durchschnittsalter beträgt 93.0 Jahre, der Median liegt bei 92.0 Jahren. "
+                "Mit 7 Bewohnern über 90 Jahren (70.0%) zeigt sich ein hoher Anteil hochbetagter Personen, "
+                "was besondere Anforderungen an die Pflege stellt."
+            ),
+            "Betreuungsbedarf": (
+                "Der Betreuungsbedarf verteilt sich wie folgt: 2 Bewohner (20.0%) benötigen einen hohen "
+                "Betreuungsaufwand, 2 Bewohner (20.0%) haben einen mittleren Bedarf und 6 Bewohner (60.0%) weisen "
+                "einen niedrigen Betreuungsbedarf auf. Mit 60.0% sind die meisten Bewohner weitgehend "
+                "selbstständig, was die Pflegeintensität insgesamt reduziert."
+            ),
+            "Abteilungen": (
+                "Die Bewohner verteilen sich auf 3 Abteilungen. Die Station 1 ist mit 7 Bewohnern (70.0%) am "
+                "stärksten belegt. Die Station 3 weist mit 1 Bewohnern (10.0%) die geringste Belegung auf. "
+                "Die Unterschiede in der Belegung sind mit einer Differenz von 60.0 Prozentpunkten deutlich "
+                "ausgeprägt."
+            ),
+        },
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(FAELLE))
+def test_texts_match_previous_dataframe_analysis(name):
+    df, erwartet = FAELLE[name]
+
+    assert facility_narratives(summarize_facility(df)) == erwartet
+
+
+def test_batch_runs_on_summaries_without_raw_rows():
+    summaries = {
+        name: FacilitySummary.from_json(summarize_facility(df).to_json())
+        for name, (df, _) in FAELLE.items()
+    }
+
+    texte = batch_narratives(summaries)
+
+    assert texte == {name: erwartet for name, (_, erwartet) in FAELLE.items()}
+
+
+def test_sections_without_data_are_omitted():
+    summary = summarize_facility(pd.DataFrame({"Betreuungsbedarf": ["hoch", "niedrig"]}))
+
+    assert list(facility_narratives(summary)) == ["Betreuungsbedarf"]